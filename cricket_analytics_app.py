@@ -1,349 +1,472 @@
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Set page config
-st.set_page_config(page_title="IPL Analytics Dashboard", layout="wide")
-
-st.title("IPL Analytics Dashboard")
-st.markdown("Insights from IPL Matches and Deliveries")
-
-# --- Data Loading ---
-@st.cache_data
-def load_data():
-    try:
-        matches = pd.read_csv("matches.csv")
-        deliveries = pd.read_csv("deliveries.csv")
-        
-        # Preprocessing
-        matches['date'] = pd.to_datetime(matches['date'], errors='coerce')
-        matches['year'] = matches['date'].dt.year
-        
-        merged_data = deliveries.merge(matches, left_on='match_id', right_on='id', how='left')
-        return matches, deliveries, merged_data
-    except FileNotFoundError:
-        st.error("Data files (matches.csv, deliveries.csv) not found. Please ensure they are in the same directory.")
-        return None, None, None
-
-matches, deliveries, merged_data = load_data()
-
-if matches is not None:
-    # --- Helper: Identify Veterans (2008-2012) ---
-    early_seasons = matches[matches['year'].between(2008, 2012)]['id'].unique()
-    early_players_bat = deliveries[deliveries['match_id'].isin(early_seasons)]['batter'].unique()
-    early_players_bowl = deliveries[deliveries['match_id'].isin(early_seasons)]['bowler'].unique()
-
-    # --- Tabs ---
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Player Stats", "Stadium Stats", "Team Stats", "Veteran Stats", "Coach Stats"])
-
-    # --- TAB 1: PLAYER STATS ---
-    with tab1:
-        st.header("Player Performance Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        # FR1: Top Scoring Batsmen Post-2020 (Excl. Veterans)
-        with col1:
-            st.subheader("Top Scoring Batsmen Post-2020 (Excl. Veterans)")
-            post_2020_matches = matches[matches['year'] > 2020]['id'].unique()
-            post_2020_data = deliveries[deliveries['match_id'].isin(post_2020_matches)]
-            
-            fr1_data = post_2020_data[~post_2020_data['batter'].isin(early_players_bat)]
-            top_scorers = fr1_data.groupby('batter')['batsman_runs'].sum().sort_values(ascending=False).head(10)
-            
-            fig1, ax1 = plt.subplots()
-            sns.barplot(x=top_scorers.values, y=top_scorers.index, ax=ax1, palette="viridis")
-            ax1.set_xlabel("Total Runs")
-            st.pyplot(fig1)
-
-        # FR2: Power Hitters (Strike Rate)
-        with col2:
-            st.subheader("Top Power Hitters Post-2020 (Strike Rate)")
-            stats = post_2020_data.groupby('batter').agg({'batsman_runs': 'sum', 'ball': 'count'})
-            stats = stats[stats['ball'] >= 50] # Min 50 balls
-            stats['strike_rate'] = (stats['batsman_runs'] / stats['ball']) * 100
-            top_sr = stats.sort_values('strike_rate', ascending=False).head(10)
-            
-            st.dataframe(top_sr[['strike_rate', 'batsman_runs', 'ball']].style.format("{:.2f}"))
-
-        col3, col4 = st.columns(2)
-
-        # FR3: Top Fielders (All Time)
-        with col3:
-            st.subheader("Top Fielders by Catches (All Time)")
-            catches = deliveries[deliveries['dismissal_kind'] == 'caught']
-            top_fielders = catches['fielder'].value_counts().head(10)
-            
-            fig3, ax3 = plt.subplots()
-            sns.barplot(x=top_fielders.values, y=top_fielders.index, ax=ax3, palette="magma")
-            ax3.set_xlabel("Catches")
-            st.pyplot(fig3)
-
-        # FR4: Top Bowlers Post-2020 (Excl. Veterans)
-        with col4:
-            st.subheader("Top Bowlers Post-2020 (Excl. Veterans)")
-            fr4_data = post_2020_data[~post_2020_data['bowler'].isin(early_players_bowl)]
-            wickets = fr4_data[fr4_data['is_wicket'] == 1]
-            wickets = wickets[~wickets['dismissal_kind'].isin(['run out', 'retired hurt', 'obstructing the field'])]
-            top_bowlers = wickets['bowler'].value_counts().head(10)
-            
-            fig4, ax4 = plt.subplots()
-            sns.barplot(x=top_bowlers.values, y=top_bowlers.index, ax=ax4, palette="coolwarm")
-            ax4.set_xlabel("Wickets")
-            st.pyplot(fig4)
-
-    # --- TAB 2: STADIUM STATS ---
-    with tab2:
-        st.header("Stadium & Match Outcome Analysis")
-
-        # Helper functions
-        def bat_first_won(row):
-            if row['result'] in ['tie', 'no result']: return False
-            if row['toss_decision'] == 'bat': return row['toss_winner'] == row['winner']
-            else: return row['toss_winner'] != row['winner']
-
-        def field_first_won(row):
-            if row['result'] in ['tie', 'no result']: return False
-            if row['toss_decision'] == 'field': return row['toss_winner'] == row['winner']
-            else: return row['toss_winner'] != row['winner']
-
-        matches['bat_first_win'] = matches.apply(bat_first_won, axis=1)
-        matches['field_first_win'] = matches.apply(field_first_won, axis=1)
-
-        # FR5 & FR7: Win Probabilities
-        st.subheader("Win Probability by Stadium (Min 10 Matches)")
-        
-        venue_stats = matches.groupby('venue').agg(
-            total_matches=('id', 'count'),
-            bat_first_wins=('bat_first_win', 'sum'),
-            field_first_wins=('field_first_win', 'sum')
-        )
-        venue_stats = venue_stats[venue_stats['total_matches'] >= 10]
-        venue_stats['Bat 1st Win %'] = (venue_stats['bat_first_wins'] / venue_stats['total_matches']) * 100
-        venue_stats['Field 1st Win %'] = (venue_stats['field_first_wins'] / venue_stats['total_matches']) * 100
-        
-        st.dataframe(venue_stats[['total_matches', 'Bat 1st Win %', 'Field 1st Win %']].style.format("{:.1f}"))
-
-        col5, col6 = st.columns(2)
-
-        # FR6: Toss Impact
-        with col5:
-            st.subheader("Toss Impact: Win Toss -> Win Match %")
-            matches['toss_win_match_win'] = matches['toss_winner'] == matches['winner']
-            toss_impact = matches.groupby('venue').agg(
-                matches=('id', 'count'),
-                wins=('toss_win_match_win', 'sum')
-            )
-            toss_impact = toss_impact[toss_impact['matches'] >= 10]
-            toss_impact['win_prob'] = (toss_impact['wins'] / toss_impact['matches']) * 100
-            top_toss_venues = toss_impact.sort_values('win_prob', ascending=False).head(10)
-            
-            fig6, ax6 = plt.subplots()
-            sns.barplot(x=top_toss_venues['win_prob'], y=top_toss_venues.index, ax=ax6, palette="Blues_d")
-            ax6.set_xlabel("Win Probability %")
-            st.pyplot(fig6)
-
-        # FR8: Avg Runs
-        with col6:
-            st.subheader("Avg Total Runs: Bat 1st vs Bat 2nd")
-            # Simple approximation: Sum of runs per inning / number of innings
-            # A more robust way is grouping by match_id and inning
-            inning_scores = merged_data.groupby(['match_id', 'inning'])['total_runs'].sum().reset_index()
-            avg_scores = inning_scores.groupby('inning')['total_runs'].mean()
-            
-            # Filter for inning 1 and 2 only
-            avg_scores = avg_scores[avg_scores.index.isin([1, 2])]
-            
-            fig8, ax8 = plt.subplots()
-            sns.barplot(x=avg_scores.index, y=avg_scores.values, ax=ax8)
-            ax8.set_xticklabels(['1st Innings', '2nd Innings'])
-            ax8.set_ylabel("Avg Runs")
-            st.pyplot(fig8)
-
-    # --- TAB 3: TEAM STATS ---
-    with tab3:
-        st.header("Team Performance Analysis")
-        
-        col7, col8 = st.columns(2)
-
-        # FR9: Winning % Post-2020
-        with col7:
-            st.subheader("Team Winning % Post-2020")
-            recent_matches = matches[matches['year'] > 2020]
-            team_stats = pd.concat([recent_matches['team1'], recent_matches['team2']]).value_counts().reset_index()
-            team_stats.columns = ['team', 'matches_played']
-            
-            wins = recent_matches['winner'].value_counts().reset_index()
-            wins.columns = ['team', 'wins']
-            
-            team_perf = team_stats.merge(wins, on='team', how='left').fillna(0)
-            team_perf['win_pct'] = (team_perf['wins'] / team_perf['matches_played']) * 100
-            team_perf = team_perf.sort_values('win_pct', ascending=False)
-            
-            fig9, ax9 = plt.subplots()
-            sns.barplot(x=team_perf['win_pct'], y=team_perf['team'], ax=ax9, palette="RdYlGn")
-            ax9.set_xlabel("Win %")
-            st.pyplot(fig9)
-
-        # FR10: Highest Successful Run Chases
-        with col8:
-            st.subheader("Highest Successful Run Chases (All Time)")
-            # Filter matches where team batting second won
-            chase_wins = matches[matches.apply(field_first_won, axis=1)]
-            
-            # Get target scores (Inning 1 total)
-            # We need to sum runs for inning 1 for these match_ids
-            inn1_runs = merged_data[merged_data['inning'] == 1].groupby('match_id')['total_runs'].sum().reset_index()
-            
-            chases = chase_wins.merge(inn1_runs, left_on='id', right_on='match_id')
-            top_chases = chases.sort_values('total_runs', ascending=False).head(10)
-            
-            st.dataframe(top_chases[['season', 'winner', 'venue', 'total_runs']].rename(columns={'total_runs': 'Target Chased'}))
-
-    # --- TAB 4: VETERAN STATS ---
-    with tab4:
-        st.header("Veteran Player Analysis (Post-2020)")
-        st.markdown("Analysis of players active in 2008-2012 who are still playing post-2020.")
-
-        col9, col10 = st.columns(2)
-
-        # FR1 (Veterans): Top Scoring Veterans
-        with col9:
-            st.subheader("Top Scoring Veterans Post-2020")
-            # Filter for veterans
-            fr1_vet_data = post_2020_data[post_2020_data['batter'].isin(early_players_bat)]
-            top_vet_scorers = fr1_vet_data.groupby('batter')['batsman_runs'].sum().sort_values(ascending=False).head(10)
-            
-            fig_v1, ax_v1 = plt.subplots()
-            sns.barplot(x=top_vet_scorers.values, y=top_vet_scorers.index, ax=ax_v1, palette="viridis")
-            ax_v1.set_xlabel("Total Runs")
-            st.pyplot(fig_v1)
-
-        # FR4 (Veterans): Top Bowling Veterans
-        with col10:
-            st.subheader("Top Bowling Veterans Post-2020")
-            fr4_vet_data = post_2020_data[post_2020_data['bowler'].isin(early_players_bowl)]
-            vet_wickets = fr4_vet_data[fr4_vet_data['is_wicket'] == 1]
-            vet_wickets = vet_wickets[~vet_wickets['dismissal_kind'].isin(['run out', 'retired hurt', 'obstructing the field'])]
-            top_vet_bowlers = vet_wickets['bowler'].value_counts().head(10)
-            
-            fig_v4, ax_v4 = plt.subplots()
-            sns.barplot(x=top_vet_bowlers.values, y=top_vet_bowlers.index, ax=ax_v4, palette="coolwarm")
-            ax_v4.set_xlabel("Wickets")
-            st.pyplot(fig_v4)
-
-    # --- TAB 5: COACH STATS ---
-    with tab5:
-        st.header("Coach Potential Analysis (Veterans)")
-        st.markdown("Evaluating veterans based on team success and experience.")
-
-        # Identify all veterans (batters and bowlers)
-        all_veterans = set(early_players_bat) | set(early_players_bowl)
-        
-        # We need to link players to matches to calculate win %
-        # Create a mapping of match_id -> list of players in that match
-        # This can be slow, so let's optimize.
-        # We can get player-match pairs from deliveries
-        player_match = deliveries[['match_id', 'batter', 'bowler', 'non_striker']].melt(id_vars='match_id', value_name='player').drop(columns='variable').drop_duplicates()
-        
-        # Filter for veterans only to reduce size
-        vet_matches = player_match[player_match['player'].isin(all_veterans)]
-        
-        # Merge with match results
-        vet_match_results = vet_matches.merge(matches[['id', 'winner', 'team1', 'team2', 'season', 'toss_decision', 'toss_winner', 'result']], left_on='match_id', right_on='id')
-        
-        # Determine if the player's team won
-        # We don't explicitly know which team a player played for in 'deliveries' easily without more processing
-        # BUT, we can infer it:
-        # In deliveries, batting_team is available.
-        
-        # Let's re-do the player-match mapping with team info
-        # Get batters and their teams
-        batters = deliveries[['match_id', 'batter', 'batting_team']].drop_duplicates().rename(columns={'batter': 'player', 'batting_team': 'team'})
-        # Get bowlers and their teams (bowling team is the opposite of batting team, which is tricky)
-        # Easier: Just use batters for now, as most veterans bat. Or use the fact that 'bowling_team' exists in some datasets, but here we only have 'batting_team'.
-        # Actually, every player bats or bowls.
-        # If a player bowled, their team is NOT the batting_team of that row.
-        # Let's stick to batters for team mapping to be safe, or assume everyone batted at least once or was listed? No.
-        # Let's assume the dataset has 'batting_team' and 'bowling_team' columns?
-        # Let's check columns of deliveries.
-        # If not, we can infer bowling team.
-        
-        # Simplification: Use 'batting_team' for batters. For bowlers, we can try to find when they batted.
-        # If a player never batted in a match, we might miss their team.
-        # However, for "Coach Stats", we are looking at influential players who likely batted.
-        
-        player_teams = batters
-        
-        # Filter for veterans
-        vet_teams = player_teams[player_teams['player'].isin(all_veterans)]
-        
-        # Merge with match winner
-        vet_perf = vet_teams.merge(matches[['id', 'winner', 'bat_first_win', 'field_first_win']], left_on='match_id', right_on='id')
-        
-        vet_perf['won'] = vet_perf['team'] == vet_perf['winner']
-        
-        # FR9 (Coach): Win %
-        st.subheader("FR9: Veteran Win % (Min 50 Matches)")
-        vet_win_stats = vet_perf.groupby('player').agg(
-            matches=('id', 'count'),
-            wins=('won', 'sum')
-        )
-        vet_win_stats = vet_win_stats[vet_win_stats['matches'] >= 50]
-        vet_win_stats['win_pct'] = (vet_win_stats['wins'] / vet_win_stats['matches']) * 100
-        top_coaches_win = vet_win_stats.sort_values('win_pct', ascending=False).head(10)
-        
-        st.dataframe(top_coaches_win.style.format({'win_pct': '{:.2f}%'}))
-
-        col11, col12 = st.columns(2)
-
-        # FR10 (Coach): Successful Run Chases
-        with col11:
-            st.subheader("FR10: Successful Run Chases (Part of Winning Team)")
-            # Filter for matches where team fielded first and won (Chase win)
-            # Wait, field_first_win means the team that fielded first won.
-            # If a player's team won AND the match was won by the team fielding first, then it's a chase win?
-            # No, we need to know if the player's team was the one fielding first.
-            # If player's team == winner AND field_first_win is True (meaning toss winner chose field and won OR toss winner chose bat and lost... wait)
-            # Let's use the 'won' column. If won=True, we just need to know if it was a chase.
-            # A chase win happens if the winning team batted second.
-            
-            # We need to know if 'team' batted second.
-            # In 'matches', we have toss_decision and toss_winner.
-            # If toss_decision='field' and toss_winner=team -> Batted 2nd.
-            # If toss_decision='bat' and toss_winner!=team -> Batted 2nd.
-            
-            def is_chase_win(row):
-                if not row['won']: return False
-                # Row has 'team', 'toss_winner', 'toss_decision' (need to merge these)
-                return False # Placeholder
-            
-            # Let's merge toss info back
-            vet_perf_full = vet_perf.merge(matches[['id', 'toss_winner', 'toss_decision']], on='id')
-            
-            def check_chase(row):
-                if not row['won']: return False
-                if row['toss_decision'] == 'field' and row['toss_winner'] == row['team']: return True
-                if row['toss_decision'] == 'bat' and row['toss_winner'] != row['team']: return True
-                return False
-
-            vet_perf_full['chase_win'] = vet_perf_full.apply(check_chase, axis=1)
-            
-            chase_stats = vet_perf_full.groupby('player')['chase_win'].sum().sort_values(ascending=False).head(10)
-            
-            st.dataframe(chase_stats.to_frame(name="Successful Chases"))
-
-        # FR11 (Coach): Experience
-        with col12:
-            st.subheader("FR11: Experience (Total Matches Played)")
-            # We already calculated matches in vet_win_stats, but that had a filter.
-            # Let's recalculate for all veterans
-            experience = vet_perf.groupby('player')['id'].count().sort_values(ascending=False).head(10)
-            
-            fig_c11, ax_c11 = plt.subplots()
-            sns.barplot(x=experience.values, y=experience.index, ax=ax_c11, palette="copper")
-            ax_c11.set_xlabel("Matches Played")
-            st.pyplot(fig_c11)
-
-
+import os
+
+import altair as alt
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+# Set page config
+st.set_page_config(page_title="IPL Analytics Dashboard", layout="wide")
+
+st.title("IPL Analytics Dashboard")
+st.markdown("Insights from IPL Matches and Deliveries")
+
+# --- Data Loading ---
+# The columns each table actually contributes to the dashboard; everything
+# else stays on disk. Explicit narrow dtypes for the numeric columns spare
+# the CSV parser its type-inference pass and shrink the frames further
+# (per-delivery counts all fit in int8).
+MATCHES_COLS = ['id', 'season', 'date', 'venue', 'team1', 'team2',
+                'toss_winner', 'toss_decision', 'winner', 'result']
+MATCHES_DTYPES = {'id': 'int32'}
+DELIVERIES_COLS = ['match_id', 'inning', 'ball', 'batter', 'bowler',
+                   'batting_team', 'batsman_runs', 'total_runs', 'is_wicket',
+                   'dismissal_kind', 'fielder']
+DELIVERIES_DTYPES = {'match_id': 'int32', 'inning': 'int8', 'ball': 'int8',
+                     'batsman_runs': 'int8', 'total_runs': 'int8', 'is_wicket': 'int8'}
+
+def read_table(csv_name, columns, dtypes=None):
+    """Read a table via a Parquet sidecar, converting from CSV on first run.
+
+    Parquet is typed, columnar and compressed, so warm starts skip CSV parsing
+    entirely and pull only the columns the app uses off disk. The one-time CSV
+    parse reads only those columns too, with declared dtypes.
+    """
+    parquet_name = csv_name.replace('.csv', '.parquet')
+    try:
+        if not os.path.exists(parquet_name):
+            pd.read_csv(csv_name, usecols=columns, dtype=dtypes).to_parquet(parquet_name)
+        return pd.read_parquet(parquet_name, columns=columns)
+    except ImportError:
+        # No parquet engine installed; fall back to plain CSV.
+        return pd.read_csv(csv_name, usecols=columns, dtype=dtypes)
+
+@st.cache_data
+def load_data():
+    try:
+        matches = read_table("matches.csv", MATCHES_COLS, MATCHES_DTYPES)
+        deliveries = read_table("deliveries.csv", DELIVERIES_COLS, DELIVERIES_DTYPES)
+
+        # Preprocessing
+        matches['date'] = pd.to_datetime(matches['date'], errors='coerce')
+        matches['year'] = matches['date'].dt.year
+
+        # Match outcome flags, computed once for every consumer.
+        # A match counts only if it produced a winner. Batting first wins when
+        # the toss decision and the toss->match outcome agree (chose bat and
+        # won, or chose field and lost); fielding first wins in the opposite case.
+        valid_result = ~matches['result'].isin(['tie', 'no result'])
+        toss_bat = matches['toss_decision'].eq('bat')
+        toss_won_match = matches['toss_winner'].eq(matches['winner'])
+        matches['bat_first_win'] = valid_result & (toss_bat == toss_won_match)
+        matches['field_first_win'] = valid_result & (toss_bat != toss_won_match)
+
+        # The side that batted second: the toss winner if it chose to field,
+        # otherwise its opponent.
+        matches['batting_second_team'] = np.where(
+            matches['toss_decision'] == 'field', matches['toss_winner'],
+            np.where(matches['team1'] == matches['toss_winner'], matches['team2'], matches['team1']))
+
+        # Categorical dtypes: these columns are all heavily repeated strings.
+        # As categories, groupby/isin/value_counts hash small integer codes
+        # instead of Python strings, and memory drops roughly tenfold. The
+        # team columns share one dtype so equality comparisons between them
+        # (toss_winner vs winner, team vs batting_second_team, ...) stay valid.
+        all_teams = pd.unique(pd.concat([matches['team1'], matches['team2'], deliveries['batting_team']]).dropna())
+        team_dtype = pd.CategoricalDtype(all_teams)
+        for col in ['team1', 'team2', 'winner', 'toss_winner', 'batting_second_team']:
+            matches[col] = matches[col].astype(team_dtype)
+        deliveries['batting_team'] = deliveries['batting_team'].astype(team_dtype)
+        for col in ['venue', 'toss_decision', 'result']:
+            matches[col] = matches[col].astype('category')
+        for col in ['batter', 'bowler', 'fielder', 'dismissal_kind']:
+            deliveries[col] = deliveries[col].astype('category')
+
+        return matches, deliveries
+    except FileNotFoundError:
+        st.error("Data files (matches.csv, deliveries.csv) not found. Please ensure they are in the same directory.")
+        return None, None
+
+@st.cache_data
+def get_veterans(matches_small, deliveries_small):
+    """Players who batted/bowled in the 2008-2012 seasons. Cached so reruns skip the isin/unique passes.
+
+    Returns plain tuples of names: the veterans are passed on to other cached
+    helpers, and st.cache_data cannot hash pandas extension arrays (the
+    Categorical/ArrowStringArray that .unique() yields here).
+    """
+    early_seasons = matches_small[matches_small['year'].between(2008, 2012)]['id'].unique()
+    early_deliveries = deliveries_small[deliveries_small['match_id'].isin(early_seasons)]
+    return (tuple(map(str, early_deliveries['batter'].unique())),
+            tuple(map(str, early_deliveries['bowler'].unique())))
+
+@st.cache_data
+def veteran_mask(players, veterans):
+    """Boolean mask of rows whose player is a 2008-2012 veteran.
+
+    Matches on the integer category codes with np.isin instead of hashing
+    names, and is cached so tab switches reuse the same array.
+    """
+    vet_codes = players.cat.categories.get_indexer(veterans)
+    return np.isin(players.cat.codes.values, vet_codes[vet_codes >= 0])
+
+@st.cache_data
+def get_post2020(matches_small, deliveries):
+    """Deliveries from matches played after 2020. Cached so reruns skip the filter pass."""
+    post_2020_matches = matches_small[matches_small['year'] > 2020]['id'].unique()
+    return deliveries[deliveries['match_id'].isin(post_2020_matches)]
+
+# --- Cached Aggregations ---
+# The CSVs never change within a session, so every aggregation below is a
+# cache hit after the first render. Each helper returns a small (~10 row)
+# result, keeping cache memory negligible.
+
+@st.cache_data
+def top_scorers_post2020(batting_small):
+    """Top 10 run scorers from the given post-2020 slice."""
+    return batting_small.groupby('batter', observed=True, sort=False)['batsman_runs'].sum().nlargest(10)
+
+@st.cache_data
+def top_strike_rates_post2020(post_2020_small):
+    """Top 10 strike rates post-2020 (min 50 balls faced)."""
+    stats = post_2020_small.groupby('batter', observed=True, sort=False).agg({'batsman_runs': 'sum', 'ball': 'count'})
+    stats = stats[stats['ball'] >= 50] # Min 50 balls
+    stats['strike_rate'] = (stats['batsman_runs'] / stats['ball']) * 100
+    return stats.nlargest(10, 'strike_rate')
+
+@st.cache_data
+def get_wicket_rows(deliveries_small):
+    """Only the dismissal rows — under 5% of deliveries.
+
+    Every wicket-based panel (catches, bowler wickets, veteran wickets) starts
+    from this frame, so the full-table scan on is_wicket happens exactly once
+    and the dismissal_kind tests run over the small remainder.
+    """
+    return deliveries_small[deliveries_small['is_wicket'] == 1].drop(columns='is_wicket')
+
+@st.cache_data
+def top_fielders_all_time(wickets_small):
+    """Top 10 catch takers across all seasons."""
+    catches = wickets_small[wickets_small['dismissal_kind'] == 'caught']
+    return catches['fielder'].value_counts().nlargest(10)
+
+@st.cache_data
+def top_bowlers_post2020(wickets_small):
+    """Top 10 wicket takers from the given slice of bowler-credited dismissals."""
+    return wickets_small['bowler'].value_counts().nlargest(10)
+
+@st.cache_data
+def venue_win_stats(matches_small):
+    """Bat-first vs field-first win % per venue (min 10 matches)."""
+    venue_stats = matches_small.groupby('venue', observed=True, sort=False).agg(
+        total_matches=('id', 'count'),
+        bat_first_wins=('bat_first_win', 'sum'),
+        field_first_wins=('field_first_win', 'sum')
+    )
+    venue_stats = venue_stats[venue_stats['total_matches'] >= 10]
+    venue_stats['Bat 1st Win %'] = (venue_stats['bat_first_wins'] / venue_stats['total_matches']) * 100
+    venue_stats['Field 1st Win %'] = (venue_stats['field_first_wins'] / venue_stats['total_matches']) * 100
+    return venue_stats[['total_matches', 'Bat 1st Win %', 'Field 1st Win %']].sort_index()
+
+@st.cache_data
+def toss_impact_by_venue(matches_small):
+    """Top 10 venues where winning the toss most often means winning the match (min 10 matches)."""
+    matches_small['toss_win_match_win'] = matches_small['toss_winner'] == matches_small['winner']
+    toss_impact = matches_small.groupby('venue', observed=True, sort=False).agg(
+        matches=('id', 'count'),
+        wins=('toss_win_match_win', 'sum')
+    )
+    toss_impact = toss_impact[toss_impact['matches'] >= 10]
+    toss_impact['win_prob'] = (toss_impact['wins'] / toss_impact['matches']) * 100
+    return toss_impact.nlargest(10, 'win_prob')
+
+@st.cache_data
+def compute_inning_totals(deliveries_small):
+    """Total runs per match and inning — one row per match, innings as columns.
+
+    This is the most expensive groupby in the app (it touches every delivery),
+    and both the innings-average and run-chase panels need it, so compute it
+    exactly once.
+    """
+    return deliveries_small.groupby(['match_id', 'inning'], observed=True, sort=False)['total_runs'].sum().unstack('inning')
+
+@st.cache_data
+def team_win_pct_post2020(matches_small):
+    """Win % per team across post-2020 matches."""
+    recent_matches = matches_small[matches_small['year'] > 2020]
+    # team1/team2/winner share one categorical dtype, so bincount over their
+    # integer codes tallies appearances and wins in O(n) with no hashing and
+    # no concat+merge round trip (code -1 is NaN, i.e. no result).
+    teams = recent_matches['team1'].cat.categories
+    played_codes = np.concatenate([recent_matches['team1'].cat.codes.values,
+                                   recent_matches['team2'].cat.codes.values])
+    played = np.bincount(played_codes[played_codes >= 0], minlength=len(teams))
+    win_codes = recent_matches['winner'].cat.codes.values
+    wins = np.bincount(win_codes[win_codes >= 0], minlength=len(teams))
+
+    team_perf = pd.DataFrame({'team': teams, 'matches_played': played, 'wins': wins})
+    # Keep only teams that actually played post-2020.
+    team_perf = team_perf[team_perf['matches_played'] > 0]
+    team_perf['win_pct'] = (team_perf['wins'] / team_perf['matches_played']) * 100
+    return team_perf.sort_values('win_pct', ascending=False)
+
+@st.cache_data
+def top_run_chases(matches_small, inn1_totals):
+    """Ten highest first-innings totals that were successfully chased down."""
+    # Filter matches where team batting second won, then attach the target
+    # (inning 1 total) from the precomputed per-match innings table.
+    chase_wins = matches_small[matches_small['field_first_win']]
+    chases = chase_wins.merge(inn1_totals.rename('Target Chased'), left_on='id', right_index=True)
+    top_chases = chases.nlargest(10, 'Target Chased')
+    return top_chases[['season', 'winner', 'venue', 'Target Chased']]
+
+@st.cache_data
+def veteran_performance(deliveries_small, matches_small, veterans_bat, veterans_bowl):
+    """Veteran player-match pairs with team and outcome, inferred from batting appearances."""
+    all_veterans = set(veterans_bat) | set(veterans_bowl)
+
+    # Determine which team a player played for.
+    # We don't explicitly know which team a player played for in 'deliveries' easily without more processing
+    # BUT, we can infer it: in deliveries, batting_team is available.
+    # Get batters and their teams. A groupby over (match_id, batter codes)
+    # collapses duplicates on integers instead of hashing string tuples the
+    # way drop_duplicates on the raw columns would.
+    batters = (deliveries_small.groupby(['match_id', 'batter'], sort=False, observed=True)['batting_team']
+               .first().reset_index().rename(columns={'batter': 'player', 'batting_team': 'team'}))
+    # For bowlers, their team is NOT the batting_team of that row, which is tricky to invert.
+    # Simplification: Use 'batting_team' for batters. If a player never batted in a match,
+    # we might miss their team. However, for "Coach Stats", we are looking at influential
+    # players who likely batted.
+    player_teams = batters
+
+    # Filter for veterans
+    vet_teams = player_teams[player_teams['player'].isin(all_veterans)]
+
+    # Merge with match winner
+    vet_perf = vet_teams.merge(matches_small[['id', 'winner', 'bat_first_win', 'field_first_win']], left_on='match_id', right_on='id')
+    vet_perf['won'] = vet_perf['team'] == vet_perf['winner']
+    return vet_perf
+
+@st.cache_data
+def coach_kpis(vet_perf, matches_small):
+    """Matches played, wins and chase wins per veteran, from one groupby pass.
+
+    The three coach panels (win %, chases, experience) all slice this small
+    per-player table instead of re-grouping the player-match frame each.
+    """
+    vet_perf_full = vet_perf.merge(matches_small[['id', 'batting_second_team']], on='id')
+    # A chase win happens if the player's (winning) team batted second.
+    vet_perf_full['chase_win'] = vet_perf_full['won'] & (vet_perf_full['team'] == vet_perf_full['batting_second_team'])
+    return vet_perf_full.groupby('player', observed=True, sort=False).agg(
+        matches=('id', 'count'),
+        wins=('won', 'sum'),
+        chases=('chase_win', 'sum')
+    )
+
+def ranked_bar_chart(series, value_label, name_label):
+    """Horizontal bar chart ordered by value, rendered client-side.
+
+    Vega-Lite ships the ~10 data points to the browser instead of rasterizing
+    a matplotlib figure server-side on every rerun.
+    """
+    data = series.rename_axis(name_label).reset_index(name=value_label)
+    chart = alt.Chart(data).mark_bar().encode(
+        x=alt.X(value_label, type='quantitative'),
+        y=alt.Y(name_label, type='nominal', sort='-x'))
+    st.altair_chart(chart, use_container_width=True)
+
+# --- Tab Renderers ---
+# Each tab is a fragment, so a widget interaction or rerun inside one tab
+# replays only that tab's body instead of the whole script.
+
+@st.fragment
+def render_player_tab(fr1_data, post_2020_data, wicket_rows, fr4_wickets):
+    st.header("Player Performance Analysis")
+
+    col1, col2 = st.columns(2)
+
+    # FR1: Top Scoring Batsmen Post-2020 (Excl. Veterans)
+    with col1:
+        st.subheader("Top Scoring Batsmen Post-2020 (Excl. Veterans)")
+        top_scorers = top_scorers_post2020(fr1_data[['batter', 'batsman_runs']])
+
+        ranked_bar_chart(top_scorers, "Total Runs", "Batter")
+
+    # FR2: Power Hitters (Strike Rate)
+    with col2:
+        st.subheader("Top Power Hitters Post-2020 (Strike Rate)")
+        top_sr = top_strike_rates_post2020(post_2020_data[['batter', 'batsman_runs', 'ball']])
+
+        st.dataframe(top_sr[['strike_rate', 'batsman_runs', 'ball']].style.format("{:.2f}"))
+
+    col3, col4 = st.columns(2)
+
+    # FR3: Top Fielders (All Time)
+    with col3:
+        st.subheader("Top Fielders by Catches (All Time)")
+        top_fielders = top_fielders_all_time(wicket_rows[['dismissal_kind', 'fielder']])
+
+        ranked_bar_chart(top_fielders, "Catches", "Fielder")
+
+    # FR4: Top Bowlers Post-2020 (Excl. Veterans)
+    with col4:
+        st.subheader("Top Bowlers Post-2020 (Excl. Veterans)")
+        top_bowlers = top_bowlers_post2020(fr4_wickets[['bowler']])
+
+        ranked_bar_chart(top_bowlers, "Wickets", "Bowler")
+
+@st.fragment
+def render_stadium_tab(matches, inning_totals):
+    st.header("Stadium & Match Outcome Analysis")
+
+    # FR5 & FR7: Win Probabilities
+    st.subheader("Win Probability by Stadium (Min 10 Matches)")
+    venue_table = venue_win_stats(matches[['venue', 'id', 'bat_first_win', 'field_first_win']])
+
+    st.dataframe(venue_table.style.format("{:.1f}"))
+
+    col5, col6 = st.columns(2)
+
+    # FR6: Toss Impact
+    with col5:
+        st.subheader("Toss Impact: Win Toss -> Win Match %")
+        top_toss_venues = toss_impact_by_venue(matches[['venue', 'id', 'toss_winner', 'winner']])
+
+        ranked_bar_chart(top_toss_venues['win_prob'], "Win Probability %", "Venue")
+
+    # FR8: Avg Runs
+    with col6:
+        st.subheader("Avg Total Runs: Bat 1st vs Bat 2nd")
+        avg_scores = inning_totals.mean()
+        # Filter for inning 1 and 2 only
+        avg_scores = avg_scores[avg_scores.index.isin([1, 2])]
+
+        st.bar_chart(avg_scores.rename({1: '1st Innings', 2: '2nd Innings'}), y_label="Avg Runs")
+
+@st.fragment
+def render_team_tab(matches, inning_totals):
+    st.header("Team Performance Analysis")
+
+    col7, col8 = st.columns(2)
+
+    # FR9: Winning % Post-2020
+    with col7:
+        st.subheader("Team Winning % Post-2020")
+        team_perf = team_win_pct_post2020(matches[['year', 'team1', 'team2', 'winner']])
+
+        ranked_bar_chart(team_perf.set_index('team')['win_pct'], "Win %", "Team")
+
+    # FR10: Highest Successful Run Chases
+    with col8:
+        st.subheader("Highest Successful Run Chases (All Time)")
+        top_chases = top_run_chases(
+            matches[['id', 'season', 'winner', 'venue', 'field_first_win']],
+            inning_totals[1])
+
+        st.dataframe(top_chases)
+
+@st.fragment
+def render_veteran_tab(fr1_vet_data, fr4_vet_wickets):
+    st.header("Veteran Player Analysis (Post-2020)")
+    st.markdown("Analysis of players active in 2008-2012 who are still playing post-2020.")
+
+    col9, col10 = st.columns(2)
+
+    # FR1 (Veterans): Top Scoring Veterans
+    with col9:
+        st.subheader("Top Scoring Veterans Post-2020")
+        top_vet_scorers = top_scorers_post2020(fr1_vet_data[['batter', 'batsman_runs']])
+
+        ranked_bar_chart(top_vet_scorers, "Total Runs", "Batter")
+
+    # FR4 (Veterans): Top Bowling Veterans
+    with col10:
+        st.subheader("Top Bowling Veterans Post-2020")
+        top_vet_bowlers = top_bowlers_post2020(fr4_vet_wickets[['bowler']])
+
+        ranked_bar_chart(top_vet_bowlers, "Wickets", "Bowler")
+
+@st.fragment
+def render_coach_tab(deliveries, matches, veterans_bat, veterans_bowl):
+    st.header("Coach Potential Analysis (Veterans)")
+    st.markdown("Evaluating veterans based on team success and experience.")
+
+    vet_perf = veteran_performance(
+        deliveries[['match_id', 'batter', 'batting_team']],
+        matches[['id', 'winner', 'bat_first_win', 'field_first_win']],
+        veterans_bat, veterans_bowl)
+    kpis = coach_kpis(vet_perf, matches[['id', 'batting_second_team']])
+
+    # FR9 (Coach): Win % (Min 50 Matches)
+    st.subheader("FR9: Veteran Win % (Min 50 Matches)")
+    vet_win_stats = kpis[kpis['matches'] >= 50].copy()
+    vet_win_stats['win_pct'] = (vet_win_stats['wins'] / vet_win_stats['matches']) * 100
+    top_coaches_win = vet_win_stats.nlargest(10, 'win_pct')[['matches', 'wins', 'win_pct']]
+
+    st.dataframe(top_coaches_win.style.format({'win_pct': '{:.2f}%'}))
+
+    col11, col12 = st.columns(2)
+
+    # FR10 (Coach): Successful Run Chases
+    with col11:
+        st.subheader("FR10: Successful Run Chases (Part of Winning Team)")
+        chase_stats = kpis['chases'].nlargest(10)
+
+        st.dataframe(chase_stats.to_frame(name="Successful Chases"))
+
+    # FR11 (Coach): Experience
+    with col12:
+        st.subheader("FR11: Experience (Total Matches Played)")
+        # Unlike FR9 this ranks all veterans, with no minimum-match filter.
+        experience = kpis['matches'].nlargest(10)
+
+        ranked_bar_chart(experience, "Matches Played", "Player")
+
+matches, deliveries = load_data()
+
+if matches is not None:
+    # --- Helper: Identify Veterans (2008-2012) and the Post-2020 subset ---
+    # Pass only the columns each helper needs so Streamlit's input hashing stays cheap.
+    early_players_bat, early_players_bowl = get_veterans(
+        matches[['id', 'year']], deliveries[['match_id', 'batter', 'bowler']])
+    post_2020_data = get_post2020(matches[['id', 'year']], deliveries)
+    inning_totals = compute_inning_totals(deliveries[['match_id', 'inning', 'total_runs']])
+
+    # Veteran / non-veteran splits of the post-2020 deliveries, computed once
+    # and shared by Tabs 1 and 4 — every isin pass rebuilds a hash set over
+    # millions of rows, so don't repeat it per panel.
+    is_vet_batter = veteran_mask(post_2020_data['batter'], early_players_bat)
+    fr1_data = post_2020_data[~is_vet_batter]
+    fr1_vet_data = post_2020_data[is_vet_batter]
+
+    # Wicket rows, filtered once, then narrowed to bowler-credited post-2020
+    # dismissals and split by the veteran mask for Tabs 1 and 4.
+    wicket_rows = get_wicket_rows(deliveries[['match_id', 'bowler', 'dismissal_kind', 'fielder', 'is_wicket']])
+    bowler_wickets = wicket_rows[~wicket_rows['dismissal_kind'].isin(['run out', 'retired hurt', 'obstructing the field'])]
+    post_2020_wickets = bowler_wickets[bowler_wickets['match_id'].isin(matches.loc[matches['year'] > 2020, 'id'])]
+    is_vet_bowler = veteran_mask(post_2020_wickets['bowler'], early_players_bowl)
+    fr4_wickets = post_2020_wickets[~is_vet_bowler]
+    fr4_vet_wickets = post_2020_wickets[is_vet_bowler]
+
+    # --- Tabs ---
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Player Stats", "Stadium Stats", "Team Stats", "Veteran Stats", "Coach Stats"])
+
+    # --- TAB 1: PLAYER STATS ---
+    with tab1:
+        render_player_tab(fr1_data, post_2020_data, wicket_rows, fr4_wickets)
+
+    # --- TAB 2: STADIUM STATS ---
+    with tab2:
+        render_stadium_tab(matches, inning_totals)
+
+    # --- TAB 3: TEAM STATS ---
+    with tab3:
+        render_team_tab(matches, inning_totals)
+
+    # --- TAB 4: VETERAN STATS ---
+    with tab4:
+        render_veteran_tab(fr1_vet_data, fr4_vet_wickets)
+
+    # --- TAB 5: COACH STATS ---
+    with tab5:
+        render_coach_tab(deliveries, matches, early_players_bat, early_players_bowl)